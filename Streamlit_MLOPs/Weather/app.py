@@ -1,7 +1,9 @@
 import streamlit as st
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+import time
 import os
+from concurrent.futures import ThreadPoolExecutor
 try:
     from dotenv import load_dotenv
     load_dotenv()
@@ -19,35 +21,112 @@ def get_api_key():
 API_KEY = get_api_key()
 BASE_URL = "http://api.openweathermap.org/data/2.5/weather"
 
+# Shared session so keep-alive connections are reused across requests
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=10))
+SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=10))
+
 def kelvin_to_celsius(kelvin):
     return kelvin - 273.15
 
 def kelvin_to_fahrenheit(kelvin):
     return (kelvin - 273.15) * 9/5 + 32
 
-def get_weather_data(city):
-    if not API_KEY:
-        st.error("API key not found. Please configure the OPENWEATHER_API_KEY in your environment.")
-        return None
-        
+# Responses are cached for 10 minutes; failed requests raise and are not cached
+@st.cache_data(ttl=600, show_spinner=False)
+def fetch_weather(city):
     params = {
         'q': city,
         'appid': API_KEY,
     }
     
-    try:
-        response = requests.get(BASE_URL, params=params)
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        st.error(f"Error fetching weather data: {e}")
-        return None
+    response = SESSION.get(BASE_URL, params=params, timeout=5)
+    response.raise_for_status()
+    return response.json()
+
+def get_weather_batch(cities):
+    """Fetches weather for several cities in parallel.
+    Returns a dict mapping each city to its data, or None if the request failed."""
+    if not API_KEY:
+        st.error("API key not found. Please configure the OPENWEATHER_API_KEY in your environment.")
+        return {}
+    
+    # Requests are I/O-bound, so threads let their network latencies overlap
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {city: executor.submit(fetch_weather, city) for city in cities}
+    
+    # Errors are reported from the main thread, where Streamlit calls are allowed
+    results = {}
+    for city, future in futures.items():
+        try:
+            results[city] = future.result()
+        except requests.exceptions.RequestException as e:
+            st.error(f"Error fetching weather data for {city}: {e}")
+            results[city] = None
+    return results
+
+def display_weather(weather_data, temp_unit):
+    # Create columns for layout
+    col1, col2 = st.columns(2)
+
+    # Basic weather information
+    with col1:
+        st.subheader("Current Weather")
+        weather_desc = weather_data['weather'][0]['description'].title()
+        st.write(f"**Condition:** {weather_desc}")
+
+        temp_k = weather_data['main']['temp']
+        if temp_unit == 'Celsius':
+            temp = round(kelvin_to_celsius(temp_k), 1)
+            unit = "°C"
+        else:
+            temp = round(kelvin_to_fahrenheit(temp_k), 1)
+            unit = "°F"
+
+        st.write(f"**Temperature:** {temp}{unit}")
+        st.write(f"**Humidity:** {weather_data['main']['humidity']}%")
+
+    # Additional weather details
+    with col2:
+        st.subheader("Additional Info")
+
+        wind_speed = weather_data['wind']['speed']
+        st.write(f"**Wind Speed:** {wind_speed} m/s")
+
+        if 'rain' in weather_data:
+            rain = weather_data['rain'].get('1h', 0)
+            st.write(f"**Rainfall (1h):** {rain} mm")
+
+        pressure = weather_data['main']['pressure']
+        st.write(f"**Pressure:** {pressure} hPa")
+
+    # Sunrise and Sunset times
+    st.subheader("Sun Times")
+    col3, col4 = st.columns(2)
+
+    # OpenWeather reports the city's offset from UTC in seconds
+    tz_offset = weather_data.get('timezone', 0)
+
+    with col3:
+        sunrise_timestamp = weather_data['sys']['sunrise']
+        sunrise_time = time.strftime('%H:%M', time.gmtime(sunrise_timestamp + tz_offset))
+        st.write(f"**Sunrise:** {sunrise_time}")
+
+    with col4:
+        sunset_timestamp = weather_data['sys']['sunset']
+        sunset_time = time.strftime('%H:%M', time.gmtime(sunset_timestamp + tz_offset))
+        st.write(f"**Sunset:** {sunset_time}")
+
+    # Location details
+    st.subheader("Location Details")
+    st.write(f"**Country:** {weather_data['sys']['country']}")
+    st.write(f"**Coordinates:** Lat {weather_data['coord']['lat']}, Lon {weather_data['coord']['lon']}")
 
 def main():
     st.title("Weather Information App")
     
     # Add a city input textbox
-    city = st.text_input("Enter City Name:")
+    cities_input = st.text_input("Enter City Names (comma-separated):")
     
     # Add temperature unit selection
     temp_unit = st.radio(
@@ -55,62 +134,17 @@ def main():
         ('Celsius', 'Fahrenheit')
     )
     
-    if city:
-        weather_data = get_weather_data(city)
+    # Drop blanks and duplicates while keeping the entered order
+    cities = list(dict.fromkeys(city.strip() for city in cities_input.split(',') if city.strip()))
+    
+    if cities:
+        weather_by_city = get_weather_batch(cities)
         
-        if weather_data:
-            # Create columns for layout
-            col1, col2 = st.columns(2)
-            
-            # Basic weather information
-            with col1:
-                st.subheader("Current Weather")
-                weather_desc = weather_data['weather'][0]['description'].title()
-                st.write(f"**Condition:** {weather_desc}")
-                
-                temp_k = weather_data['main']['temp']
-                if temp_unit == 'Celsius':
-                    temp = round(kelvin_to_celsius(temp_k), 1)
-                    unit = "°C"
-                else:
-                    temp = round(kelvin_to_fahrenheit(temp_k), 1)
-                    unit = "°F"
-                
-                st.write(f"**Temperature:** {temp}{unit}")
-                st.write(f"**Humidity:** {weather_data['main']['humidity']}%")
-                
-            # Additional weather details
-            with col2:
-                st.subheader("Additional Info")
-                
-                wind_speed = weather_data['wind']['speed']
-                st.write(f"**Wind Speed:** {wind_speed} m/s")
-                
-                if 'rain' in weather_data:
-                    rain = weather_data['rain'].get('1h', 0)
-                    st.write(f"**Rainfall (1h):** {rain} mm")
-                
-                pressure = weather_data['main']['pressure']
-                st.write(f"**Pressure:** {pressure} hPa")
-            
-            # Sunrise and Sunset times
-            st.subheader("Sun Times")
-            col3, col4 = st.columns(2)
-            
-            with col3:
-                sunrise_timestamp = weather_data['sys']['sunrise']
-                sunrise_time = datetime.fromtimestamp(sunrise_timestamp)
-                st.write(f"**Sunrise:** {sunrise_time.strftime('%H:%M')}")
-            
-            with col4:
-                sunset_timestamp = weather_data['sys']['sunset']
-                sunset_time = datetime.fromtimestamp(sunset_timestamp)
-                st.write(f"**Sunset:** {sunset_time.strftime('%H:%M')}")
-            
-            # Location details
-            st.subheader("Location Details")
-            st.write(f"**Country:** {weather_data['sys']['country']}")
-            st.write(f"**Coordinates:** Lat {weather_data['coord']['lat']}, Lon {weather_data['coord']['lon']}")
+        for weather_data in weather_by_city.values():
+            if weather_data:
+                if len(cities) > 1:
+                    st.header(f"{weather_data['name']}, {weather_data['sys']['country']}")
+                display_weather(weather_data, temp_unit)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,23 +1,294 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
-import io
-import base64
+import plotly.graph_objects as go
 
-def load_data(file):
+# Cached results are global to the server process, so they are bounded in count
+# and expire after an hour to keep memory in check as files are uploaded
+CACHE_TTL = 3600
+MAX_FILES = 4
+# Helpers keyed on columns or options as well as the file keep a few more entries
+MAX_PLOT_ENTRIES = 32
+
+@st.cache_data(show_spinner=False, max_entries=MAX_FILES, ttl=CACHE_TTL)
+def load_data(_file, data_key):
+    """Parses the uploaded CSV once per upload; data_key identifies the file
+    so the upload is neither copied nor hashed on every rerun"""
     try:
-        df = pd.read_csv(file)
+        try:
+            # The pyarrow engine parses with multiple threads
+            _file.seek(0)
+            df = pd.read_csv(_file, engine='pyarrow')
+        except Exception:
+            # Fall back to the default engine if pyarrow is missing or rejects the file
+            _file.seek(0)
+            df = pd.read_csv(_file)
         return df
     except Exception as e:
-        st.error(f"Error loading file: {e}")
+        st.error(f"Error loading file {_file.name}: {e}")
         return None
 
-def get_download_link(df, filename="data.csv"):
-    """Generates a link to download the dataframe as CSV"""
-    csv = df.to_csv(index=False)
-    b64 = base64.b64encode(csv.encode()).decode()
-    href = f'<a href="data:file/csv;base64,{b64}" download="{filename}">Download CSV file</a>'
-    return href
+@st.cache_data(show_spinner=False, max_entries=MAX_FILES, ttl=CACHE_TTL)
+def get_summary(_df, data_key):
+    return _df.describe()
+
+@st.cache_data(show_spinner=False, max_entries=MAX_FILES, ttl=CACHE_TTL)
+def get_numeric_columns(_df, data_key):
+    # np.number also covers int32, float32, unsigned ints, etc.
+    return _df.select_dtypes(include=np.number).columns.tolist()
+
+@st.cache_data(show_spinner=False, max_entries=MAX_FILES, ttl=CACHE_TTL)
+def get_correlation(_df, data_key, cols):
+    return _df[cols].corr()
+
+@st.cache_data(show_spinner=False, max_entries=MAX_FILES, ttl=CACHE_TTL)
+def count_missing(_df, data_key):
+    return int(_df.isna().sum().sum())
+
+@st.cache_data(show_spinner=False, max_entries=MAX_FILES, ttl=CACHE_TTL)
+def get_csv_bytes(_df, data_key):
+    """Serializes the dataframe to CSV once per uploaded file"""
+    return _df.to_csv(index=False).encode()
+
+CUSTOM_CSS = """
+    <style>
+    .main {
+        padding: 2rem;
+    }
+    .stButton>button {
+        width: 100%;
+    }
+    </style>
+"""
+
+# Series longer than this are downsampled before plotting when enabled
+DOWNSAMPLE_THRESHOLD = 5000
+
+def lttb(x, y, n_out=2000):
+    """Largest-Triangle-Three-Buckets downsampling.
+    Returns the indices of n_out points that preserve the visual shape of the series."""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    every = (n - 2) / (n_out - 2)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    
+    a = 0
+    for i in range(n_out - 2):
+        # Current bucket
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        # Average of the next bucket is the third triangle vertex
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        indices[i + 1] = a
+    
+    return indices
+
+@st.cache_data(show_spinner=False, max_entries=MAX_PLOT_ENTRIES, ttl=CACHE_TTL)
+def downsample(_df, data_key, x_col, y_col, n_out=2000):
+    """Returns a subset of rows that is visually representative of y_col against x_col"""
+    subset = _df.dropna(subset=[x_col, y_col])
+    x = subset[x_col]
+    # LTTB needs ordered numeric x values; fall back to row positions otherwise
+    if pd.api.types.is_numeric_dtype(x) and x.is_monotonic_increasing:
+        x = x.to_numpy()
+    else:
+        x = np.arange(len(subset))
+    indices = lttb(x, subset[y_col].to_numpy(), n_out)
+    return subset.iloc[indices]
+
+@st.cache_data(show_spinner=False, max_entries=MAX_PLOT_ENTRIES, ttl=CACHE_TTL)
+def sample_rows(_df, data_key, n_out=2000):
+    """Uniform random sample of rows, which keeps the point density of scatter plots.
+    LTTB is not used here since scatter x values are usually unordered."""
+    return _df.sample(n=min(n_out, len(_df)), random_state=0)
+
+# Histograms and box plots are computed server-side so only summary values
+# are sent to the browser instead of every raw value
+@st.cache_data(show_spinner=False, max_entries=MAX_PLOT_ENTRIES, ttl=CACHE_TTL)
+def get_histogram(_df, data_key, col, bins):
+    values = _df[col].to_numpy(dtype=float, na_value=np.nan)
+    # np.histogram cannot bin NaN or infinite values
+    counts, edges = np.histogram(values[np.isfinite(values)], bins=bins)
+    return (edges[:-1] + edges[1:]) / 2, counts, np.diff(edges)
+
+def box_stats(values):
+    """Quartiles, Tukey whiskers and outliers of a 1-D array"""
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    is_inside = (values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)
+    return {
+        "q1": q1,
+        "median": median,
+        "q3": q3,
+        "lowerfence": values[is_inside].min(),
+        "upperfence": values[is_inside].max(),
+        "outliers": values[~is_inside],
+    }
+
+@st.cache_data(show_spinner=False, max_entries=MAX_PLOT_ENTRIES, ttl=CACHE_TTL)
+def get_box_stats(_df, data_key, y_col, x_col=None):
+    """Returns a list of (box name, stats) pairs, one per group of x_col"""
+    if x_col is None:
+        groups = [(y_col, _df[y_col])]
+    else:
+        groups = _df.groupby(x_col, sort=False)[y_col]
+    
+    boxes = []
+    for name, values in groups:
+        values = values.to_numpy(dtype=float, na_value=np.nan)
+        # Drop NaN and infinite values, which make the quartiles undefined
+        values = values[np.isfinite(values)]
+        if len(values):
+            boxes.append((name, box_stats(values)))
+    return boxes
+
+def box_figure(boxes, title, render_mode):
+    names = [name for name, _ in boxes]
+    fig = go.Figure(go.Box(
+        x=names,
+        q1=[stats["q1"] for _, stats in boxes],
+        median=[stats["median"] for _, stats in boxes],
+        q3=[stats["q3"] for _, stats in boxes],
+        lowerfence=[stats["lowerfence"] for _, stats in boxes],
+        upperfence=[stats["upperfence"] for _, stats in boxes],
+        boxpoints=False,
+        showlegend=False
+    ))
+    
+    # Outliers are drawn as a separate marker trace
+    outlier_x = [name for name, stats in boxes for _ in stats["outliers"]]
+    outlier_y = np.concatenate([stats["outliers"] for _, stats in boxes]) if boxes else []
+    scatter = go.Scattergl if render_mode == "webgl" else go.Scatter
+    fig.add_trace(scatter(x=outlier_x, y=outlier_y, mode="markers", name="Outliers", showlegend=False))
+    fig.update_layout(title=title)
+    return fig
+
+# Each tab is a fragment, so its widgets only rerun that tab instead of the whole script
+@st.fragment
+def visualization_tab(df, data_key, numeric_cols, render_mode, use_downsampling):
+    st.subheader("Create Visualization")
+    # Every chart type plots at least one numeric column
+    if not numeric_cols:
+        st.info("The uploaded file has no numeric columns to visualize.")
+        return
+    all_cols = df.columns.tolist()
+
+    col1, col2 = st.columns([1, 2])
+
+    with col1:
+        # Visualization controls
+        chart_type = st.selectbox(
+            "Select Chart Type",
+            ["Line Chart", "Bar Chart", "Histogram", "Scatter Plot", "Box Plot"]
+        )
+
+        if chart_type in ["Line Chart", "Bar Chart"]:
+            x_col = st.selectbox("Select X-axis column", all_cols)
+            y_col = st.selectbox("Select Y-axis column", numeric_cols)
+
+            if chart_type == "Line Chart":
+                plot_df = df
+                if use_downsampling and len(df) > DOWNSAMPLE_THRESHOLD:
+                    plot_df = downsample(df, data_key, x_col, y_col)
+                fig = px.line(plot_df, x=x_col, y=y_col, title=f"{y_col} vs {x_col}",
+                              render_mode=render_mode)
+            else:  # Bar Chart
+                fig = px.bar(df, x=x_col, y=y_col, title=f"{y_col} by {x_col}")
+
+        elif chart_type == "Histogram":
+            col = st.selectbox("Select column for histogram", numeric_cols)
+            bins = st.slider("Number of bins", min_value=5, max_value=50, value=20)
+            centers, counts, widths = get_histogram(df, data_key, col, bins)
+            fig = go.Figure(go.Bar(x=centers, y=counts, width=widths))
+            fig.update_layout(title=f"Histogram of {col}", xaxis_title=col, yaxis_title="count",
+                              bargap=0)
+
+        elif chart_type == "Box Plot":
+            y_col = st.selectbox("Select column for box plot", numeric_cols)
+            x_col = st.selectbox("Select grouping column (optional)", ["None"] + all_cols)
+            if x_col == "None":
+                boxes = get_box_stats(df, data_key, y_col)
+                fig = box_figure(boxes, f"Box Plot of {y_col}", render_mode)
+            else:
+                boxes = get_box_stats(df, data_key, y_col, x_col)
+                fig = box_figure(boxes, f"Box Plot of {y_col} by {x_col}", render_mode)
+                fig.update_layout(xaxis_title=x_col)
+            fig.update_layout(yaxis_title=y_col)
+
+        else:  # Scatter Plot
+            x_col = st.selectbox("Select X-axis column", numeric_cols)
+            y_col = st.selectbox("Select Y-axis column", numeric_cols)
+            color_col = st.selectbox("Select color column (optional)", ["None"] + all_cols)
+
+            plot_df = df
+            if use_downsampling and len(df) > DOWNSAMPLE_THRESHOLD:
+                plot_df = sample_rows(df, data_key)
+
+            if color_col == "None":
+                fig = px.scatter(plot_df, x=x_col, y=y_col, title=f"{y_col} vs {x_col}",
+                                 render_mode=render_mode)
+            else:
+                fig = px.scatter(plot_df, x=x_col, y=y_col, color=color_col,
+                                 title=f"{y_col} vs {x_col} by {color_col}",
+                                 render_mode=render_mode)
+
+    with col2:
+        # Display the plot
+        st.plotly_chart(fig, use_container_width=True)
+
+@st.fragment
+def analysis_tab(df, data_key, numeric_cols):
+    st.subheader("Data Analysis")
+
+    # Data info
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Number of Rows", df.shape[0])
+    with col2:
+        st.metric("Number of Columns", df.shape[1])
+    with col3:
+        st.metric("Missing Values", count_missing(df, data_key))
+
+    # Basic statistics
+    st.subheader("Statistical Summary")
+    st.dataframe(get_summary(df, data_key), use_container_width=True)
+
+    # Correlation matrix
+    if len(numeric_cols) > 1:
+        st.subheader("Correlation Matrix")
+        corr = get_correlation(df, data_key, numeric_cols)
+        fig_corr = px.imshow(corr,
+                             title="Correlation Matrix",
+                             color_continuous_scale="RdBu")
+        st.plotly_chart(fig_corr, use_container_width=True)
+
+@st.fragment
+def raw_data_tab(df, data_key):
+    st.subheader("Raw Data Preview")
+    st.dataframe(df, use_container_width=True)
+
+    # Download button
+    st.download_button(
+        "Download CSV file",
+        data=get_csv_bytes(df, data_key),
+        file_name="data.csv",
+        mime="text/csv"
+    )
 
 def main():
     # Set page config
@@ -28,16 +299,7 @@ def main():
     )
     
     # Add custom CSS
-    st.markdown("""
-        <style>
-        .main {
-            padding: 2rem;
-        }
-        .stButton>button {
-            width: 100%;
-        }
-        </style>
-    """, unsafe_allow_html=True)
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
     
     st.title("📊 CSV Data Visualizer")
     st.write("Upload your CSV file and create interactive visualizations")
@@ -50,95 +312,36 @@ def main():
     )
     
     if uploaded_file is not None:
-        df = load_data(uploaded_file)
+        # file_id is unique per upload, so it keys every cache without hashing the data
+        data_key = uploaded_file.file_id
+        df = load_data(uploaded_file, data_key)
         
         if df is not None:
+            numeric_cols = get_numeric_columns(df, data_key)
+            
+            # WebGL is much faster for large datasets; SVG is kept for browsers without GPU support
+            use_svg = st.sidebar.checkbox(
+                "Use SVG (compat mode)",
+                help="Render charts with SVG instead of WebGL for browsers where WebGL is unavailable"
+            )
+            render_mode = "svg" if use_svg else "webgl"
+            use_downsampling = st.sidebar.checkbox(
+                "Downsample for speed",
+                value=True,
+                help=f"Reduce line charts to representative points and sample scatter plots when the data has more than {DOWNSAMPLE_THRESHOLD} rows"
+            )
+            
             # Create tabs for different sections
             tab1, tab2, tab3 = st.tabs(["📈 Visualizations", "📊 Data Analysis", "📑 Raw Data"])
             
             with tab1:
-                st.subheader("Create Visualization")
-                
-                col1, col2 = st.columns([1, 2])
-                
-                with col1:
-                    # Visualization controls
-                    chart_type = st.selectbox(
-                        "Select Chart Type",
-                        ["Line Chart", "Bar Chart", "Histogram", "Scatter Plot", "Box Plot"]
-                    )
-                    
-                    # Get numerical columns
-                    numeric_cols = df.select_dtypes(include=['float64', 'int64']).columns
-                    
-                    if chart_type in ["Line Chart", "Bar Chart"]:
-                        x_col = st.selectbox("Select X-axis column", df.columns)
-                        y_col = st.selectbox("Select Y-axis column", numeric_cols)
-                        
-                        if chart_type == "Line Chart":
-                            fig = px.line(df, x=x_col, y=y_col, title=f"{y_col} vs {x_col}")
-                        else:  # Bar Chart
-                            fig = px.bar(df, x=x_col, y=y_col, title=f"{y_col} by {x_col}")
-                    
-                    elif chart_type == "Histogram":
-                        col = st.selectbox("Select column for histogram", numeric_cols)
-                        bins = st.slider("Number of bins", min_value=5, max_value=50, value=20)
-                        fig = px.histogram(df, x=col, nbins=bins, title=f"Histogram of {col}")
-                    
-                    elif chart_type == "Box Plot":
-                        y_col = st.selectbox("Select column for box plot", numeric_cols)
-                        x_col = st.selectbox("Select grouping column (optional)", ["None"] + list(df.columns))
-                        if x_col == "None":
-                            fig = px.box(df, y=y_col, title=f"Box Plot of {y_col}")
-                        else:
-                            fig = px.box(df, x=x_col, y=y_col, title=f"Box Plot of {y_col} by {x_col}")
-                    
-                    else:  # Scatter Plot
-                        x_col = st.selectbox("Select X-axis column", numeric_cols)
-                        y_col = st.selectbox("Select Y-axis column", numeric_cols)
-                        color_col = st.selectbox("Select color column (optional)", ["None"] + list(df.columns))
-                        
-                        if color_col == "None":
-                            fig = px.scatter(df, x=x_col, y=y_col, title=f"{y_col} vs {x_col}")
-                        else:
-                            fig = px.scatter(df, x=x_col, y=y_col, color=color_col, 
-                                          title=f"{y_col} vs {x_col} by {color_col}")
-                
-                with col2:
-                    # Display the plot
-                    st.plotly_chart(fig, use_container_width=True)
+                visualization_tab(df, data_key, numeric_cols, render_mode, use_downsampling)
             
             with tab2:
-                st.subheader("Data Analysis")
-                
-                # Data info
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Number of Rows", df.shape[0])
-                with col2:
-                    st.metric("Number of Columns", df.shape[1])
-                with col3:
-                    st.metric("Missing Values", df.isna().sum().sum())
-                
-                # Basic statistics
-                st.subheader("Statistical Summary")
-                st.dataframe(df.describe(), use_container_width=True)
-                
-                # Correlation matrix
-                if len(numeric_cols) > 1:
-                    st.subheader("Correlation Matrix")
-                    corr = df[numeric_cols].corr()
-                    fig_corr = px.imshow(corr, 
-                                       title="Correlation Matrix",
-                                       color_continuous_scale="RdBu")
-                    st.plotly_chart(fig_corr, use_container_width=True)
+                analysis_tab(df, data_key, numeric_cols)
             
             with tab3:
-                st.subheader("Raw Data Preview")
-                st.dataframe(df, use_container_width=True)
-                
-                # Download button
-                st.markdown(get_download_link(df), unsafe_allow_html=True)
+                raw_data_tab(df, data_key)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
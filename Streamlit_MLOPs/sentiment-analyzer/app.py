@@ -1,83 +1,125 @@
 import streamlit as st
 import nltk
-from textblob import TextBlob
 import pandas as pd
-import plotly.express as px
+import plotly.graph_objects as go
 from collections import Counter
+import functools
 import re
 import warnings
 
 # Suppress TextBlob warnings
 warnings.filterwarnings("ignore", category=UserWarning)
 
+# Patterns are compiled once at import instead of on every call
+NON_ALPHA_PATTERN = re.compile(r'[^a-zA-Z\s]')
+# Matches one sentence: a run between punctuation marks starting at a non-space character
+SENTENCE_PATTERN = re.compile(r'[^.!?\s][^.!?]*')
+
+POS_TAGS_EXPLANATION = """
+**Common POS Tags:**
+- NN: Noun
+- VB: Verb
+- JJ: Adjective
+- RB: Adverb
+- DT: Determiner
+- IN: Preposition
+- CC: Conjunction
+- PRP: Personal Pronoun
+"""
+
 # Text cleaning function
 def clean_text(text):
-    # Remove special characters and digits
-    text = re.sub(r'[^a-zA-Z\s]', '', text)
-    # Convert to lowercase
-    text = text.lower()
-    return text
+    # Remove special characters and digits, then convert to lowercase
+    return NON_ALPHA_PATTERN.sub('', text).lower()
 
 # Download required NLTK data at startup
 @st.cache_resource  # Ensures the download happens only once
 def download_nltk_data():
-    try:
-        nltk.download('punkt', quiet=True)  # Added quiet=True to suppress download messages
-        nltk.download('averaged_perceptron_tagger', quiet=True)
-    except Exception as e:
-        pass  # Silently handle any download issues since the core functionality works
+    resources = {
+        'punkt': 'tokenizers/punkt',
+        'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger',
+        # Resource names used by newer NLTK releases
+        'punkt_tab': 'tokenizers/punkt_tab',
+        'averaged_perceptron_tagger_eng': 'taggers/averaged_perceptron_tagger_eng',
+    }
+    for name, path in resources.items():
+        try:
+            # Skip the network call when the data is already installed
+            nltk.data.find(path)
+        except LookupError:
+            try:
+                nltk.download(name, quiet=True)  # Added quiet=True to suppress download messages
+            except Exception:
+                pass  # Silently handle any download issues since the core functionality works
 
 # Download data at startup
 download_nltk_data()
 
+def get_pos_tags(text):
+    # Tag the whole text in one pass rather than sentence by sentence through TextBlob
+    tagged = nltk.pos_tag(nltk.word_tokenize(text))
+    # Transpose (word, tag) pairs and keep only the tags, dropping punctuation
+    # tags such as '.' and ',' as TextBlob did
+    tags = list(zip(*tagged))[1] if tagged else ()
+    return [tag for tag in tags if tag[0].isalpha()]
+
+# TextBlob is imported lazily since it is slow to load
+@functools.lru_cache(maxsize=1)
+def get_textblob():
+    from textblob import TextBlob
+    return TextBlob
+
+def count_sentences(text):
+    # Count matches lazily instead of building a list of split sentences
+    return sum(1 for _ in SENTENCE_PATTERN.finditer(text))
+
+# Text analysis is cached per text so reruns from other widgets skip it.
+# Failures raise and are not cached; the wrapper below supplies the fallback.
+@st.cache_data(show_spinner=False, max_entries=128)
+def compute_text_details(text):
+    if not text.strip():
+        return {
+            "word_count": 0,
+            "sentence_count": 0,
+            "pos_counts": Counter()
+        }
+    
+    return {
+        "word_count": len(text.split()),
+        "sentence_count": count_sentences(text),
+        "pos_counts": Counter(get_pos_tags(text))
+    }
+
 # Function to analyze text details
 def analyze_text_details(text):
     try:
-        if not text.strip():
-            return {
-                "word_count": 0,
-                "sentence_count": 0,
-                "pos_counts": Counter()
-            }
-            
-        # Split text into words
-        words = text.split()
-        # Basic sentence splitting on punctuation
-        sentences = [s.strip() for s in re.split('[.!?]+', text) if s.strip()]
-        
-        # Wrap TextBlob analysis in try-except to suppress corpora warning
-        try:
-            blob = TextBlob(text)
-            pos_counts = Counter(tag for word, tag in blob.tags)
-        except Exception:
-            # If POS tagging fails, continue with basic analysis
-            pos_counts = Counter()
-        
-        return {
-            "word_count": len(words),
-            "sentence_count": len(sentences),
-            "pos_counts": pos_counts
-        }
+        return compute_text_details(text)
     except Exception:
-        # Return empty results without showing error
+        # If POS tagging fails (e.g. missing NLTK data), continue with basic analysis
         return {
             "word_count": len(text.split()),
-            "sentence_count": len([s.strip() for s in re.split('[.!?]+', text) if s.strip()]),
+            "sentence_count": count_sentences(text),
             "pos_counts": Counter()
         }
 
+@st.cache_data(show_spinner=False, max_entries=128)
+def compute_sentiment(text):
+    blob = get_textblob()(text)
+    polarity = blob.sentiment.polarity
+    subjectivity = blob.sentiment.subjectivity
+    category = "Positive" if polarity > 0 else "Negative" if polarity < 0 else "Neutral"
+    return {
+        "polarity": polarity,
+        "subjectivity": subjectivity,
+        "category": category
+    }
+
 # Function to get sentiment analysis
 def get_sentiment(text):
+    # Imported outside the try so a missing textblob fails loudly instead of reading as Neutral
+    get_textblob()
     try:
-        blob = TextBlob(text)
-        polarity = blob.sentiment.polarity
-        subjectivity = blob.sentiment.subjectivity
-        category = "Positive" if polarity > 0 else "Negative" if polarity < 0 else "Neutral"
-        return {
-            "polarity": polarity,
-            "subjectivity": subjectivity,
-            "category": category
-        }
+        return compute_sentiment(text)
     except Exception:
         # If sentiment analysis fails, return neutral values without showing error
         return {
@@ -133,52 +175,46 @@ def main():
             st.write(f"Sentence Count: {text_details['sentence_count']}")
 
         if text_details['pos_counts']:
-            # Create a DataFrame for parts of speech
-            pos_df = pd.DataFrame({
-                'Part of Speech': list(text_details['pos_counts'].keys()),
-                'Count': list(text_details['pos_counts'].values())
-            })
-
-            # Plot parts of speech distribution
-            fig = px.bar(pos_df,
-                         x='Part of Speech',
-                         y='Count',
-                         title='Parts of Speech Distribution')
+            # Plot parts of speech distribution, most frequent first
+            pos_items = text_details['pos_counts'].most_common()
+            fig = go.Figure(go.Bar(x=[tag for tag, _ in pos_items],
+                                   y=[count for _, count in pos_items]))
+            fig.update_layout(title='Parts of Speech Distribution',
+                              xaxis_title='Part of Speech',
+                              yaxis_title='Count')
             st.plotly_chart(fig)
 
             # Display explanation of POS tags
             if st.checkbox("Show POS Tags Explanation"):
-                st.markdown("""
-                **Common POS Tags:**
-                - NN: Noun
-                - VB: Verb
-                - JJ: Adjective
-                - RB: Adverb
-                - DT: Determiner
-                - IN: Preposition
-                - CC: Conjunction
-                - PRP: Personal Pronoun
-                """)
+                st.markdown(POS_TAGS_EXPLANATION)
 
         # Add history tracking
         if 'history' not in st.session_state:
+            # Rows are appended as tuples; the DataFrame is only built for display
             st.session_state.history = []
+            # Keys of recorded analyses for constant-time duplicate checks
+            st.session_state.history_keys = set()
 
         # Add current analysis to history
-        current_analysis = {
-            'text': text_input[:50] + "..." if len(text_input) > 50 else text_input,
-            'sentiment': sentiment_results['category'],
-            'polarity': sentiment_results['polarity']
-        }
-
-        if current_analysis not in st.session_state.history:
+        current_analysis = (
+            text_input[:50] + "..." if len(text_input) > 50 else text_input,
+            sentiment_results['category'],
+            sentiment_results['polarity']
+        )
+
+        if current_analysis not in st.session_state.history_keys:
+            st.session_state.history_keys.add(current_analysis)
             st.session_state.history.append(current_analysis)
 
         # Display analysis history
         if st.checkbox("Show Analysis History"):
             st.subheader("Previous Analyses")
-            history_df = pd.DataFrame(st.session_state.history)
-            st.dataframe(history_df)
+            # Only rebuild the table when new analyses have been added
+            if st.session_state.get('history_df_len') != len(st.session_state.history):
+                st.session_state.history_df = pd.DataFrame.from_records(
+                    st.session_state.history, columns=['text', 'sentiment', 'polarity'])
+                st.session_state.history_df_len = len(st.session_state.history)
+            st.dataframe(st.session_state.history_df)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file